@@ -14,6 +14,7 @@ import { format } from 'date-fns'
 import { Alert, AlertDescription, AlertTitle } from '@/components/ui/alert'
 import { Loader2, AlertCircle, CameraIcon } from 'lucide-react'
 import Image from 'next/image'
+import { authFetch } from '@/lib/auth-fetch'
 
 const eventFormSchema = z.object({
   title: z.string().min(3, "Title must be at least 3 characters"),
@@ -76,12 +77,10 @@ export default function CreateEvent() {
     setSuccess(false)
     
     try {
-      const token = localStorage.getItem('token')
-      const response = await fetch('https://event-booking-k8id.onrender.com/events/create', {
+      const response = await authFetch('https://event-booking-k8id.onrender.com/events/create', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
-          'Authorization': `Bearer ${token}`
         },
         body: JSON.stringify({
           ...values,
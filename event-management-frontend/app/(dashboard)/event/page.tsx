@@ -10,6 +10,7 @@ import { Alert, AlertDescription, AlertTitle } from '@/components/ui/alert'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
 import { useRouter } from 'next/navigation'
 import Image from 'next/image'
+import { authFetch } from '@/lib/auth-fetch'
 
 type Event = {
   id: string
@@ -39,10 +40,9 @@ export default function EventsPage() {
         const token = localStorage.getItem('token')
         if (!token) throw new Error('No token found')
 
-        const response = await fetch('https://event-booking-k8id.onrender.com/events/organize_events', {
+        const response = await authFetch('https://event-booking-k8id.onrender.com/events/organize_events', {
           method: 'GET',
           headers: {
-            'Authorization': `Bearer ${token}`,
             'Content-Type': 'application/json'
           }
         })
@@ -8,6 +8,7 @@ import { Button } from "@/components/ui/button";
 import { jwtDecode } from "jwt-decode";
 import Image from "next/image";
 import { Skeleton } from "@/components/ui/skeleton";
+import { authFetch } from "@/lib/auth-fetch";
 
 interface UserInfo {
   full_name: string;
@@ -59,11 +60,7 @@ export default function UserProfilePage() {
           return;
         }
 
-        const response = await fetch(`https://event-booking-k8id.onrender.com/events/users/${userId}`, {
-          headers: {
-            "Authorization": `Bearer ${token}`,
-          },
-        });
+        const response = await authFetch(`https://event-booking-k8id.onrender.com/events/users/${userId}`);
 
         if (response.ok) {
           const data: UserInfo = await response.json();
@@ -3,6 +3,7 @@
 import React, { useEffect, useState, useCallback } from 'react'
 import { toast, Toaster } from 'react-hot-toast'
 import { motion } from 'framer-motion'
+import { authFetch } from '@/lib/auth-fetch'
 
 interface Event {
   id: string
@@ -41,9 +42,8 @@ export default function AdminEventsPage() {
     }
 
     try {
-      const response = await fetch('https://event-booking-k8id.onrender.com/admin/all_events', {
+      const response = await authFetch('https://event-booking-k8id.onrender.com/admin/all_events', {
         headers: {
-          'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         }
       })
@@ -81,10 +81,9 @@ export default function AdminEventsPage() {
     const toastId = toast.loading(`Updating event to ${status}...`)
     
     try {
-      const response = await fetch(`https://event-booking-k8id.onrender.com/events/${eventId}/${status}`, {
+      const response = await authFetch(`https://event-booking-k8id.onrender.com/events/${eventId}/${status}`, {
         method: 'PUT',
         headers: {
-          'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         }
       })
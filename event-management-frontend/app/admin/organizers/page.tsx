@@ -3,6 +3,7 @@
 import React, { useEffect, useState, useCallback } from 'react'
 import toast, { Toaster } from 'react-hot-toast'
 import { motion } from 'framer-motion'
+import { authFetch } from '@/lib/auth-fetch'
 
 interface Organizer {
   id: string
@@ -39,9 +40,8 @@ export default function AdminOrganizersPage() {
     }
 
     try {
-      const response = await fetch('https://event-booking-k8id.onrender.com/admin/organizers', {
+      const response = await authFetch('https://event-booking-k8id.onrender.com/admin/organizers', {
         headers: {
-          'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         }
       })
@@ -78,10 +78,9 @@ export default function AdminOrganizersPage() {
     const toastId = toast.loading(`Updating organizer to ${status}...`)
     
     try {
-      const response = await fetch(`https://event-booking-k8id.onrender.com/admin/organizers/${userId}`, {
+      const response = await authFetch(`https://event-booking-k8id.onrender.com/admin/organizers/${userId}`, {
         method: 'PUT',
         headers: {
-          'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         },
         body: JSON.stringify({
@@ -129,10 +128,9 @@ export default function AdminOrganizersPage() {
     const toastId = toast.loading('Deleting organizer...')
     
     try {
-      const response = await fetch(`https://event-booking-k8id.onrender.com/admin/organizers/${userId}`, {
+      const response = await authFetch(`https://event-booking-k8id.onrender.com/admin/organizers/${userId}`, {
         method: 'DELETE',
         headers: {
-          'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
         }
       })
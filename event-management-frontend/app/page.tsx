@@ -11,6 +11,7 @@ import { Badge } from '@/components/ui/badge';
 import AnimatedBackground from '@/components/animated-background'; // Import the new component
 import { useRouter } from "next/navigation";
 import AnimatedHeadline from "@/components/animated-template";
+import { authFetch } from "@/lib/auth-fetch";
 
 interface Event {
     id: string;
@@ -81,11 +82,10 @@ export default function Home() {
         }
     
         try {
-            const response = await fetch('https://event-booking-k8id.onrender.com/bookings/book', {
+            const response = await authFetch('https://event-booking-k8id.onrender.com/bookings/book', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${token}`
                 },
                 body: JSON.stringify({ user_email: userEmail, event_id: eventId }), // Send both user_email & event_id
             });
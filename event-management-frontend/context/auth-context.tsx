@@ -2,6 +2,7 @@
 
 import { useRouter } from 'next/navigation'
 import { createContext, useContext, useState, ReactNode, useEffect } from 'react'
+import { authFetch, clearTokens, storeTokens } from '@/lib/auth-fetch'
 
 type User = {
   email: string
@@ -41,7 +42,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     const responseData = await response.json()
     
     // Extract token and user information
-    const { access_token, token_type, user_role, user_status } = responseData
+    const { access_token, refresh_token, token_type, user_role, user_status } = responseData
     
     // Create a user object to match your User type
     const userData: User = {
@@ -51,8 +52,8 @@ export function AuthProvider({ children }: { children: ReactNode }) {
       status: user_status
     }
     
-    // Store both token and user data
-    localStorage.setItem('token', access_token)
+    // Store the tokens and user data; the refresh token renews the short-lived access token
+    storeTokens(access_token, refresh_token)
     localStorage.setItem('user', JSON.stringify(userData))
     
     setUser(userData)
@@ -73,8 +74,12 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   }
 
   const logout = () => {
+    // Revoke the session server-side; local state is cleared either way
+    if (localStorage.getItem('token')) {
+      authFetch('https://event-booking-k8id.onrender.com/auth/logout', { method: 'POST' }).catch(() => {})
+    }
     localStorage.removeItem('user')
-    localStorage.removeItem('token')
+    clearTokens()
     setUser(null)
     router.push("/")
 
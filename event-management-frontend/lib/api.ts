@@ -2,6 +2,7 @@
 import { Booking } from '@/types/booking';
 import { OrganizerStatus, UserCreate } from '@/types/user';
 import axios from 'axios';
+import { refreshAccessToken } from './auth-fetch';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:8000';
 
@@ -20,6 +21,22 @@ api.interceptors.request.use((config) => {
   }
   return config;
 });
+
+// On 401, refresh the access token once and retry the request
+api.interceptors.response.use(undefined, async (error) => {
+  const config = error.config;
+  if (error.response?.status !== 401 || !config || config._retried) {
+    return Promise.reject(error);
+  }
+  const failedToken = config.headers.Authorization?.toString().replace('Bearer ', '') ?? null;
+  const token = await refreshAccessToken(failedToken);
+  if (!token) return Promise.reject(error);
+
+  config._retried = true;
+  config.headers.Authorization = `Bearer ${token}`;
+  return api(config);
+});
+
 export const authService = {
     async login(email: string, password: string) {
       try {
@@ -0,0 +1,67 @@
+// Tokens are issued by the same API as /auth/login in context/auth-context.tsx
+const AUTH_API_URL = 'https://event-booking-k8id.onrender.com'
+
+let pendingRefresh: Promise<string | null> | null = null
+
+export function storeTokens(accessToken: string, refreshToken?: string) {
+  localStorage.setItem('token', accessToken)
+  if (refreshToken) localStorage.setItem('refresh_token', refreshToken)
+}
+
+export function clearTokens() {
+  localStorage.removeItem('token')
+  localStorage.removeItem('refresh_token')
+}
+
+async function requestNewTokens(failedToken: string | null): Promise<string | null> {
+  // Another request or tab already refreshed: reuse its access token
+  const current = localStorage.getItem('token')
+  if (current && current !== failedToken) return current
+
+  const refreshToken = localStorage.getItem('refresh_token')
+  if (!refreshToken) return null
+
+  const response = await fetch(`${AUTH_API_URL}/auth/refresh`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  })
+  if (!response.ok) {
+    clearTokens()
+    return null
+  }
+
+  const { access_token, refresh_token } = await response.json()
+  storeTokens(access_token, refresh_token)
+  return access_token
+}
+
+/**
+ * Get a new access token after `failedToken` was rejected, or null if the
+ * session is gone. Refresh tokens rotate and reusing one revokes the whole
+ * session, so only one refresh runs at a time, across tabs too.
+ */
+export function refreshAccessToken(failedToken: string | null): Promise<string | null> {
+  if (!pendingRefresh) {
+    const run = () => requestNewTokens(failedToken)
+    pendingRefresh = (navigator.locks ? navigator.locks.request('auth-refresh', run) : run())
+      .finally(() => { pendingRefresh = null })
+  }
+  return pendingRefresh
+}
+
+/** fetch() with the stored bearer token, retried once after a refresh on 401. */
+export async function authFetch(input: string, init: RequestInit = {}): Promise<Response> {
+  const send = (token: string | null) => {
+    const headers = new Headers(init.headers)
+    if (token) headers.set('Authorization', `Bearer ${token}`)
+    return fetch(input, { ...init, headers })
+  }
+
+  const token = localStorage.getItem('token')
+  const response = await send(token)
+  if (response.status !== 401) return response
+
+  const newToken = await refreshAccessToken(token)
+  return newToken ? send(newToken) : response
+}
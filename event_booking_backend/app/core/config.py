@@ -1,27 +1,86 @@
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
+import secrets
+from typing import List, Optional
 from dotenv import load_dotenv
+from pydantic import BaseModel, model_validator
 
-# Load environment variables from .env file
-load_dotenv()
+# Placeholder that was once committed as the secret; never accepted for signing
+INSECURE_SECRET_KEYS = {"", "your_secret"}
 
-# Use the correct environment variable name
-MONGODB_URL = os.getenv("MONGODB_URL")
-DATABASE_NAME = os.getenv("DATABASE_NAME")
 
-if not MONGODB_URL:
-    raise ValueError("MONGODB_URL environment variable is not set! Check your .env file.")
+def _env_bool(value: str) -> bool:
+    return value.lower() in ["true", "1"]
 
-# Initialize MongoDB client with the correct connection string
-client = AsyncIOMotorClient(MONGODB_URL)
-db = client[DATABASE_NAME]
 
-# Security settings
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+class Settings(BaseModel):
+    """
+    Typed application settings. Load once with `Settings.from_env()` and pass
+    to `create_app`; nothing here opens connections or needs a database.
+    """
 
-# CORS settings
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "").split(",")
+    # Use the correct environment variable name
+    mongodb_url: Optional[str] = None
+    database_name: str = "event_management"
+    # Indexes are created by `python -m app.jobs.create_indexes`; set to also
+    # create them on each worker start (e.g. for local development)
+    create_indexes_on_startup: bool = False
 
-DEBUG = os.getenv("DEBUG", "False").lower() in ["true", "1"]
+    # Security settings; SECRET_KEY signs JWTs and derives ticket keys
+    secret_key: Optional[str] = None
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 14
+    initial_admin_token: Optional[str] = None
+    # Seconds between syncs of each worker's token revocation filter
+    revocation_sync_seconds: float = 5
+
+    # CORS settings
+    cors_origins: List[str] = ["*"]
+
+    debug: bool = False
+
+    # Public base URL of this API (e.g. https://api.example.com). Stored image
+    # URLs are absolute so the frontend can use them as-is; defaults to the
+    # base URL of the upload request
+    public_api_url: Optional[str] = None
+
+    # Event image cache settings
+    image_cache_dir: str = "image_cache"
+    image_cache_max_bytes: int = 512 * 1024 * 1024  # Thumbnails, evicted LRU
+    image_originals_max_bytes: int = 4 * 1024 * 1024 * 1024  # Uploads refused past this
+    image_workers: int = 2
+
+    # Geocoding settings
+    geocoder: str = "app.services.geocoding.GazetteerGeocoder"
+    gazetteer_path: Optional[str] = None
+
+    # Request profiling: fraction of requests profiled without the X-Profile header
+    profile_sample_rate: float = 0.0
+
+    @model_validator(mode="after")
+    def check_secret_key(self) -> "Settings":
+        if (self.secret_key or "") in INSECURE_SECRET_KEYS:
+            if not self.debug:
+                raise ValueError("SECRET_KEY environment variable must be set to a private random value")
+            # Debug only: a per-process key, so tokens do not survive restarts
+            self.secret_key = secrets.token_urlsafe(32)
+        return self
+
+    @classmethod
+    def from_env(cls, env_file: Optional[str] = ".env") -> "Settings":
+        """Read settings from the environment, after loading a .env file if present."""
+        if env_file:
+            load_dotenv(env_file)
+
+        values = {}
+        for name, field in cls.model_fields.items():
+            raw = os.getenv(name.upper())
+            if raw is None or raw == "":
+                continue
+            if field.annotation is bool:
+                values[name] = _env_bool(raw)
+            elif field.annotation == List[str]:
+                values[name] = [item.strip() for item in raw.split(",") if item.strip()]
+            else:
+                values[name] = raw
+        return cls.model_validate(values)
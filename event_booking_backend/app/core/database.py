@@ -1,9 +1,32 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.core.config import MONGODB_URL,DATABASE_NAME  # Adjust import path based on your project structure
+from pymongo import ASCENDING, GEOSPHERE
+from app.core.config import Settings
+from app.core.profiling import mongo_command_timeline
 
-# Create MongoDB client
-client = AsyncIOMotorClient(MONGODB_URL)
 
-# Get the database
-db = client[DATABASE_NAME]
-users_collection = db.get_collection("users")
\ No newline at end of file
+def create_client(settings: Settings):
+    """
+    Create the MongoDB client. Called from the app lifespan rather than at
+    import time; Motor itself is imported here to keep app import fast.
+    """
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    if not settings.mongodb_url:
+        raise ValueError("MONGODB_URL environment variable is not set! Check your .env file.")
+    return AsyncIOMotorClient(settings.mongodb_url, event_listeners=[mongo_command_timeline])
+
+
+async def ensure_indexes(db):
+    """Create the indexes query routes rely on (no-op if they already exist)."""
+    await db.events.create_index(
+        [("geo", GEOSPHERE), ("status", ASCENDING), ("date", ASCENDING)],
+        name="geo_status_date"
+    )
+    # Event -> attendees lookup for the attendee manifest
+    await db.users.create_index("booked_events.event_id", name="booked_event_id")
+    await db.checkins.create_index("event_id")
+    # Token revocation and refresh token rotation
+    await db.revocations.create_index("expires_at", expireAfterSeconds=0)
+    await db.revocations.create_index("revoked_at")
+    await db.refresh_tokens.create_index("expires_at", expireAfterSeconds=0)
+    await db.refresh_tokens.create_index("session_id")
+    await db.refresh_tokens.create_index("user_id")
@@ -0,0 +1,51 @@
+import re
+
+from starlette.responses import JSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware that rejects request bodies over `max_bytes` with 413
+    on paths matching `path_pattern`, before the body is parsed or spooled.
+    Bodies without a Content-Length are counted as they arrive.
+    """
+
+    def __init__(self, app, max_bytes: int, path_pattern: str, detail: str = "Request body too large"):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_re = re.compile(path_pattern)
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.path_re.match(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        response = JSONResponse({"detail": self.detail}, status_code=413)
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            return await response(scope, receive, send)
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    await response(scope, receive, send)
+                    # The app sees a disconnect and stops reading
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
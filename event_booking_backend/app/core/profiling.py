@@ -0,0 +1,219 @@
+import asyncio
+import random
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from jose import JWTError, jwt
+from pymongo import monitoring
+
+from app.models.user import RoleEnum
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+SAMPLING_INTERVAL = 0.001  # seconds between profiler samples
+LOOP_CHECK_INTERVAL = 0.005  # seconds between event loop heartbeats
+LOOP_BLOCK_THRESHOLD = 0.02  # heartbeat lag reported as blocking
+PROFILE_BUFFER_SIZE = 50
+
+# Finished profiles, newest last; oldest are dropped once full
+profiles: deque = deque(maxlen=PROFILE_BUFFER_SIZE)
+
+# Profile of the request running in the current context, if any
+_active_profile: ContextVar[Optional[dict]] = ContextVar("active_profile", default=None)
+
+
+class MongoCommandTimeline(monitoring.CommandListener):
+    """
+    Records Mongo commands issued while a profiled request is active.
+    Motor runs commands in executor threads but copies the calling
+    context, so the active profile is visible here.
+    """
+
+    def started(self, event):
+        profile = _active_profile.get()
+        if profile is None:
+            return
+        profile["_pending"][event.request_id] = {
+            "command": event.command_name,
+            "collection": event.command.get(event.command_name),
+            "start_ms": (time.perf_counter() - profile["_started"]) * 1000,
+        }
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "failed")
+
+    def _finish(self, event, outcome):
+        profile = _active_profile.get()
+        if profile is None:
+            return
+        command = profile["_pending"].pop(event.request_id, None)
+        if command is None:
+            return
+        command["collection"] = str(command["collection"]) if command["collection"] is not None else None
+        command["duration_ms"] = event.duration_micros / 1000
+        command["outcome"] = outcome
+        profile["mongo_commands"].append(command)
+
+
+mongo_command_timeline = MongoCommandTimeline()
+
+
+class LoopBlockMonitor:
+    """
+    Detects event loop blocking (e.g. sync bcrypt) by measuring how late a
+    periodic heartbeat wakes up. Only runs while profiled requests are active.
+    """
+
+    def __init__(self):
+        self._profiles = []
+        self._task: Optional[asyncio.Task] = None
+        self._expected = 0.0  # loop time the next heartbeat is due
+
+    def attach(self, profile: dict):
+        self._profiles.append(profile)
+        if self._task is None or self._task.done():
+            loop = asyncio.get_running_loop()
+            self._expected = loop.time() + LOOP_CHECK_INTERVAL
+            self._task = loop.create_task(self._run())
+
+    def detach(self, profile: dict):
+        self._profiles.remove(profile)
+        # A block still in progress would otherwise only be seen after the
+        # request has already finished
+        lag = asyncio.get_running_loop().time() - self._expected
+        if lag >= LOOP_BLOCK_THRESHOLD:
+            self._record(lag, [profile])
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._profiles:
+            await asyncio.sleep(max(0.0, self._expected - loop.time()))
+            now = loop.time()
+            lag = now - self._expected
+            if lag >= LOOP_BLOCK_THRESHOLD:
+                self._record(lag, self._profiles)
+            self._expected = now + LOOP_CHECK_INTERVAL
+
+    @staticmethod
+    def _record(lag: float, profiles_blocked):
+        blocked_at = time.perf_counter() - lag
+        for profile in profiles_blocked:
+            profile["loop_blocking"].append({
+                "start_ms": max(0.0, (blocked_at - profile["_started"]) * 1000),
+                "duration_ms": lag * 1000,
+            })
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a request when an admin sends the
+    `X-Profile: 1` header, or when the request is picked by
+    `sample_rate`. Unprofiled requests only pay for a header scan.
+    """
+
+    def __init__(self, app, secret_key: str, algorithm: str, sample_rate: float = 0.0):
+        self.app = app
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.sample_rate = sample_rate
+        self.loop_monitor = LoopBlockMonitor()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        profile = {
+            "id": uuid.uuid4().hex,
+            "method": scope["method"],
+            "path": scope["path"],
+            "started_at": datetime.now(timezone.utc),
+            "status_code": None,
+            "duration_ms": None,
+            "mongo_commands": [],
+            "loop_blocking": [],
+            "_pending": {},
+            "_started": time.perf_counter(),
+        }
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile["status_code"] = message["status"]
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile["id"].encode())]
+            await send(message)
+
+        # Imported on first use: most workers never profile a request
+        from pyinstrument import Profiler
+
+        profiler = Profiler(interval=SAMPLING_INTERVAL, async_mode="enabled")
+        token = _active_profile.set(profile)
+        self.loop_monitor.attach(profile)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            self.loop_monitor.detach(profile)
+            _active_profile.reset(token)
+            profile["duration_ms"] = (time.perf_counter() - profile["_started"]) * 1000
+            profile["report"] = profiler.output_text(unicode=False, color=False)
+            profiles.append(profile)
+
+    def _should_profile(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+
+        requested = False
+        authorization = b""
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = value not in (b"", b"0", b"false")
+            elif name == b"authorization":
+                authorization = value
+        if not requested:
+            return False
+
+        # Only admins may force profiling; checked from the token claims alone
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            return False
+        return payload.get("role") == RoleEnum.admin
+
+
+def _public(profile: dict) -> dict:
+    view = {k: v for k, v in profile.items() if not k.startswith("_")}
+    view["mongo_commands"] = sorted(view["mongo_commands"], key=lambda c: c["start_ms"])
+    return view
+
+
+def list_profiles() -> List[dict]:
+    """Summaries of the buffered profiles, newest first."""
+    return [
+        {
+            "id": p["id"],
+            "method": p["method"],
+            "path": p["path"],
+            "started_at": p["started_at"],
+            "status_code": p["status_code"],
+            "duration_ms": p["duration_ms"],
+            "mongo_commands": len(p["mongo_commands"]),
+            "mongo_ms": sum(c["duration_ms"] for c in p["mongo_commands"]),
+            "loop_blocked_ms": sum(b["duration_ms"] for b in p["loop_blocking"]),
+        }
+        for p in reversed(profiles)
+    ]
+
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    profile = next((p for p in profiles if p["id"] == profile_id), None)
+    return _public(profile) if profile else None
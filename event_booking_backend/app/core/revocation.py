@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Full reload interval; drops expired entries and resizes the Bloom filter
+REBUILD_SECONDS = 600
+# Overlap between incremental syncs, to tolerate clock skew between workers
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationFilter:
+    """
+    Per-worker copy of the `revocations` collection.
+
+    A Bloom filter answers the common "not revoked" case; its positives are
+    resolved against a small exact map of key -> revocation time, so a false
+    positive never rejects a valid token. The map stays small because
+    revocations only have to outlive the short-lived access tokens.
+    """
+
+    def __init__(self, db, ttl: timedelta, sync_seconds: float, capacity: int = 10_000):
+        self.db = db
+        self.ttl = ttl  # How long a revocation must be kept: the access token lifetime
+        self.sync_seconds = sync_seconds
+        self.capacity = capacity
+        self._bloom = BloomFilter(capacity)
+        self._revoked_at: Dict[str, float] = {}
+        self._last_sync: Optional[datetime] = None
+        self._last_rebuild: Optional[datetime] = None
+
+    def add(self, key: str, revoked_at: datetime):
+        timestamp = revoked_at.replace(tzinfo=timezone.utc).timestamp()  # stored as naive UTC
+        if timestamp <= self._revoked_at.get(key, 0):
+            return
+        if len(self._revoked_at) >= self.capacity and key not in self._revoked_at:
+            # Over capacity the false-positive rate climbs; rebuild larger
+            self._resize(len(self._revoked_at) * 2)
+        self._bloom.add(key)
+        self._revoked_at[key] = timestamp
+
+    def _resize(self, capacity: int):
+        self.capacity = capacity
+        self._bloom = BloomFilter(capacity)
+        for key in self._revoked_at:
+            self._bloom.add(key)
+
+    def is_revoked(self, key: str, issued_at: float) -> bool:
+        """True if `key` was revoked at or after a token issued at `issued_at`."""
+        if key not in self._bloom:
+            return False
+        revoked_at = self._revoked_at.get(key)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    async def sync(self):
+        now = datetime.utcnow()
+        if self._last_rebuild is None or (now - self._last_rebuild).total_seconds() >= REBUILD_SECONDS:
+            docs = await self.db.revocations.find({"expires_at": {"$gt": now}}).to_list(None)
+            self.capacity = max(10_000, len(docs) * 2)
+            self._bloom = BloomFilter(self.capacity)
+            self._revoked_at = {}
+            self._last_rebuild = now
+        else:
+            query = {"revoked_at": {"$gte": self._last_sync - SYNC_OVERLAP}}
+            docs = await self.db.revocations.find(query).to_list(None)
+
+        for doc in docs:
+            self.add(doc["key"], doc["revoked_at"])
+        self._last_sync = now
+
+    async def run_sync(self):
+        """Background task keeping this worker's filter up to date."""
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Revocation sync failed")
+            await asyncio.sleep(self.sync_seconds)
+
+    async def revoke(self, key: str):
+        """
+        Revoke every access token for `key` issued up to now. Takes effect in
+        this worker immediately and in others after their next sync.
+        """
+        # MongoDB keeps milliseconds; round up so every worker sees the same
+        # cutoff and no token issued before the revocation slips under it
+        now = datetime.utcnow()
+        now += timedelta(microseconds=-now.microsecond % 1000)
+        await self.db.revocations.insert_one({"key": key, "revoked_at": now, "expires_at": now + self.ttl})
+        self.add(key, now)
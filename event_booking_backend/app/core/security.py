@@ -1,21 +1,33 @@
 
+import base64
+import hashlib
+import hmac
+import secrets
+import uuid
+from functools import lru_cache
 from typing import Optional
 from bson import ObjectId  # Add this at the top of the file
+from bson.errors import InvalidId
 from datetime import datetime, timedelta, timezone
 from app.models.user import RoleEnum
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
-from app.core.database import db
+from app.core.config import Settings
+from app.core.revocation import RevocationFilter
+from app.dependencies.resources import get_settings, get_revocations
 
-SECRET_KEY = "your_secret"
-ALGORITHM = "HS256"
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
-ACCESS_TOKEN_EXPIRE_MINUTES = 1000
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+TICKET_VERSION = 1
+TICKET_MAC_BYTES = 16  # Truncated HMAC-SHA256 keeps the QR code small
+
+@lru_cache(maxsize=None)
+def _pwd_context() -> CryptContext:
+    # Built on first use so importing this module stays cheap
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def create_access_token(data: dict, settings: Settings, expires_delta: Optional[timedelta] = None):
     """
     Create a JWT access token with secure expiration
     """
@@ -25,12 +37,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire})
+    # Sub-second iat (NumericDate allows fractions) so revocation checks are exact
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc).timestamp()})
     
     try:
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
         return encoded_jwt
     except Exception as e:
         raise HTTPException(
@@ -38,26 +51,38 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
             detail=f"Token creation failed: {str(e)}"
         )
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    settings: Settings = Depends(get_settings),
+    revocations: RevocationFilter = Depends(get_revocations)
+):
     """
-    Decode and validate JWT token
+    Decode and validate JWT token.
+    The user is built from the token claims; bans and logouts are enforced
+    through the in-memory revocation filter instead of a database read.
     """
     try:
         # Decode token with explicit algorithm
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         
         # Extract user ID and verify
         user_id = payload.get("sub")
-        if not user_id:
+        if not user_id or not ObjectId.is_valid(user_id):
             raise HTTPException(status_code=401, detail="Invalid token: No user ID")
-        
-        # Fetch user from database
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return user
+
+        issued_at = payload.get("iat", 0)
+        session_id = payload.get("sid")
+        if revocations.is_revoked(f"user:{user_id}", issued_at) or (
+            session_id and revocations.is_revoked(f"session:{session_id}", issued_at)
+        ):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
+
+        return {
+            "_id": ObjectId(user_id),
+            "role": payload.get("role"),
+            "email": payload.get("email"),
+            "session_id": session_id,
+        }
     
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -77,9 +102,115 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)):
         )
     return current_user
 
+def _hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def create_token_pair(db, settings: Settings, user: dict, session_id: Optional[str] = None) -> dict:
+    """
+    Issue a short-lived access token and a rotating refresh token.
+    Both belong to a session (refresh token family) that can be revoked as a whole.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    access_token = create_access_token({
+        "sub": str(user["_id"]),  # MUST be user ID
+        "role": user["role"],     # MUST include role
+        "email": user["email"],
+        "sid": session_id
+    }, settings)
+
+    # Only a hash is stored, so a database leak does not leak usable tokens
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    await db.refresh_tokens.insert_one({
+        "_id": _hash_refresh_token(refresh_token),
+        "user_id": user["_id"],
+        "session_id": session_id,
+        "created_at": now,
+        "expires_at": now + timedelta(days=settings.refresh_token_expire_days),
+        "used_at": None
+    })
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.access_token_expire_minutes * 60
+    }
+
+async def use_refresh_token(db, revocations: RevocationFilter, refresh_token: str) -> dict:
+    """
+    Consume a refresh token, returning its stored record.
+    A token can be used once; presenting a used one means it was stolen
+    or replayed, so its whole session is revoked.
+    """
+    token_hash = _hash_refresh_token(refresh_token)
+    now = datetime.utcnow()
+    stored = await db.refresh_tokens.find_one_and_update(
+        {"_id": token_hash, "used_at": None},
+        {"$set": {"used_at": now}}
+    )
+    if not stored:
+        reused = await db.refresh_tokens.find_one({"_id": token_hash})
+        if reused:
+            await revoke_session(db, revocations, reused["session_id"])
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    if stored["expires_at"] < now:
+        raise HTTPException(status_code=401, detail="Refresh token has expired")
+    return stored
+
+async def revoke_session(db, revocations: RevocationFilter, session_id: str):
+    """Revoke one login session: its refresh tokens and live access tokens."""
+    await db.refresh_tokens.delete_many({"session_id": session_id})
+    await revocations.revoke(f"session:{session_id}")
+
+async def revoke_user(db, revocations: RevocationFilter, user_id: ObjectId):
+    """Revoke every session of a user, e.g. when an organizer is banned."""
+    await db.refresh_tokens.delete_many({"user_id": user_id})
+    await revocations.revoke(f"user:{user_id}")
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+def get_ticket_key(event_id: str, secret_key: str) -> bytes:
+    """
+    Per-event ticket signing key derived from SECRET_KEY.
+    Scanners for an event are given only this key, never SECRET_KEY.
+    """
+    return hmac.new(
+        secret_key.encode(), b"ticket:" + ObjectId(event_id).binary, hashlib.sha256
+    ).digest()
+
+def create_ticket(event_id: str, ticket_id: str, secret_key: str) -> str:
+    """
+    Create a compact signed ticket for a QR code:
+    version (1 byte) + event ID (12) + ticket ID (12) + MAC (16), base64url.
+    """
+    payload = bytes([TICKET_VERSION]) + ObjectId(event_id).binary + ObjectId(ticket_id).binary
+    mac = hmac.new(get_ticket_key(event_id, secret_key), payload, hashlib.sha256).digest()[:TICKET_MAC_BYTES]
+    return base64.urlsafe_b64encode(payload + mac).rstrip(b"=").decode()
+
+def verify_ticket(ticket: str, key: bytes) -> Optional[dict]:
+    """
+    Verify a ticket with its event's key, without any network access.
+    Returns the event and ticket IDs, or None if the ticket is not valid.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(ticket + "=" * (-len(ticket) % 4))
+    except (ValueError, TypeError):
+        return None
+    if len(raw) != 25 + TICKET_MAC_BYTES or raw[0] != TICKET_VERSION:
+        return None
 
+    payload, mac = raw[:25], raw[25:]
+    expected = hmac.new(key, payload, hashlib.sha256).digest()[:TICKET_MAC_BYTES]
+    if not hmac.compare_digest(mac, expected):
+        return None
+
+    try:
+        return {"event_id": str(ObjectId(payload[1:13])), "ticket_id": str(ObjectId(payload[13:25]))}
+    except InvalidId:
+        return None
@@ -1,28 +1,2 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from app.core.config import SECRET_KEY, ALGORITHM
-from app.models.user import RoleEnum, UserInDB
-from bson import ObjectId
-from app.core.security import db
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
-    except Exception as e:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-async def get_current_admin(current_user: dict = Depends(get_current_user)):
-    if current_user.get("role") != RoleEnum.admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin privileges required"
-        )
-    return current_user
\ No newline at end of file
+# Kept for existing imports; the implementations live in app.core.security
+from app.core.security import get_current_user, get_current_admin
@@ -0,0 +1,25 @@
+from fastapi import Request
+from app.core.config import Settings
+
+# Resources are created in the app lifespan (see app.main.create_app)
+# and injected into routes through these dependencies.
+
+
+def get_settings(request: Request) -> Settings:
+    return request.app.state.settings
+
+
+def get_db(request: Request):
+    return request.app.state.db
+
+
+def get_revocations(request: Request):
+    return request.app.state.revocations
+
+
+def get_image_store(request: Request):
+    return request.app.state.images
+
+
+def get_geocoder(request: Request):
+    return request.app.state.geocoder
@@ -0,0 +1,29 @@
+"""
+Resolve GeoJSON coordinates for events created before `geo` existed.
+
+Usage (from event_booking_backend/):
+    python -m app.jobs.backfill_geo [--batch-size 500]
+"""
+import argparse
+import asyncio
+
+from app.core.config import Settings
+from app.core.database import create_client, ensure_indexes
+from app.services.geocoding import backfill_event_locations, load_geocoder
+
+
+async def main(batch_size: int):
+    settings = Settings.from_env()
+    client = create_client(settings)
+    db = client[settings.database_name]
+    await ensure_indexes(db)
+    counts = await backfill_event_locations(db.events, load_geocoder(settings), batch_size)
+    client.close()
+    print(f"Updated {counts['updated']} events, {counts['unresolved']} locations could not be resolved")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,23 @@
+"""
+Create the MongoDB indexes the API relies on (no-op for existing ones).
+Run once per deploy instead of on every worker start.
+
+Usage (from event_booking_backend/):
+    python -m app.jobs.create_indexes
+"""
+import asyncio
+
+from app.core.config import Settings
+from app.core.database import create_client, ensure_indexes
+
+
+async def main():
+    settings = Settings.from_env()
+    client = create_client(settings)
+    await ensure_indexes(client[settings.database_name])
+    client.close()
+    print(f"Indexes ensured on {settings.database_name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
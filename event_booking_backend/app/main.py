@@ -1,60 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Optional
 
-from dotenv import load_dotenv
-from app.models.user import UserInDB
-load_dotenv()  # Ensure .env is loaded
-from app.core.security import get_current_user
-from fastapi import FastAPI,APIRouter,Depends,HTTPException
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
-from app.routers import auth, event_routes, booking_routes,organizers,admin
-from app.core.config import db
-from bson import ObjectId
-
-# Initialize FastAPI app
-app = FastAPI(title="Event Management API", description="API for managing events and bookings")
-router = APIRouter()
-# CORS Configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow frontend to access API
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# MongoDB Connection
-MONGO_URI = os.getenv("MONGODB_URI")
-client = AsyncIOMotorClient(MONGO_URI)
-db = client["event_management"]
-
-# Include Routers
-app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-app.include_router(event_routes.router, prefix="/events", tags=["Events"])
-app.include_router(booking_routes.router, prefix="/bookings", tags=["Bookings"])
-app.include_router(organizers.router)
-app.include_router(admin.router)
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to Event Management API"}
-
-
-@app.get("/test")
-async def test_db_connection():
+
+from app.core.config import Settings
+from app.core.database import create_client, ensure_indexes
+from app.core.limits import BodySizeLimitMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.revocation import RevocationFilter
+from app.routers import auth, event_routes, booking_routes, organizers, admin
+from app.services.geocoding import load_geocoder
+from app.services.image_service import ImageStore, MAX_UPLOAD_BYTES
+
+# Room for multipart boundaries and part headers around an upload
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the database client and other per-worker resources on startup,
+    so importing the app or building it for tests touches neither.
+    """
+    settings: Settings = app.state.settings
+
+    client = create_client(settings)
+    db = client[settings.database_name]
+    # Normally done once per deploy by app.jobs.create_indexes
+    if settings.create_indexes_on_startup:
+        await ensure_indexes(db)
+
+    revocations = RevocationFilter(
+        db,
+        ttl=timedelta(minutes=settings.access_token_expire_minutes),
+        sync_seconds=settings.revocation_sync_seconds,
+    )
+    # Load revoked tokens before serving, then keep them in sync
+    await revocations.sync()
+    revocation_sync = asyncio.create_task(revocations.run_sync())
+
+    app.state.mongo_client = client
+    app.state.db = db
+    app.state.revocations = revocations
+    app.state.geocoder = load_geocoder(settings)
+    app.state.images = ImageStore(settings)
     try:
-        # Check if we can list databases
-        databases = await client.list_database_names()
-        return {"message": "Connected to MongoDB!", "databases": databases}
-    except Exception as e:
-        return {"error": str(e)}
-    
+        yield
+    finally:
+        revocation_sync.cancel()
+        app.state.images.shutdown()
+        client.close()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the API. Settings are read from the environment when not given."""
+    settings = settings or Settings.from_env()
+
+    # Initialize FastAPI app
+    app = FastAPI(
+        title="Event Management API",
+        description="API for managing events and bookings",
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+
+    # Image uploads are spooled in full before the route runs, so cap them here
+    # (added first, so it runs inside CORS and 413s carry CORS headers)
+    app.add_middleware(
+        BodySizeLimitMiddleware,
+        max_bytes=MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        path_pattern=r"^/events/[^/]+/image$",
+        detail="Image too large",
+    )
+    # CORS Configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,  # Allow frontend to access API
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(
+        ProfilingMiddleware,
+        secret_key=settings.secret_key,
+        algorithm=settings.algorithm,
+        sample_rate=settings.profile_sample_rate,
+    )
+
+    # Include Routers
+    app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
+    app.include_router(event_routes.router, prefix="/events", tags=["Events"])
+    app.include_router(booking_routes.router, prefix="/bookings", tags=["Bookings"])
+    app.include_router(organizers.router)
+    app.include_router(admin.router)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to Event Management API"}
 
-@app.on_event("startup")
-async def startup_db_client():
-    # Initialize database connection
-    pass  # Connection is already handled in database.py
+    @app.get("/test")
+    async def test_db_connection(request: Request):
+        try:
+            # Check if we can list databases
+            databases = await request.app.state.mongo_client.list_database_names()
+            return {"message": "Connected to MongoDB!", "databases": databases}
+        except Exception as e:
+            return {"error": str(e)}
 
-import logging
+    return app
 
 
+def __getattr__(name: str):
+    """
+    Build `app` on first access, for `uvicorn app.main:app`, so importing
+    this module reads no settings. Prefer `uvicorn --factory app.main:create_app`.
+    """
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 
 class Booking(BaseModel):
     user_email: str
     event_id: str
     booking_date: datetime = datetime.utcnow()
+
+class TicketScan(BaseModel):
+    ticket: str
+    scanned_at: datetime
+    device_id: Optional[str] = None
+
+class CheckInBatch(BaseModel):
+    scans: List[TicketScan] = Field(..., max_length=5000)
@@ -1,16 +1,34 @@
-from pydantic import BaseModel,HttpUrl,Field
-from typing import Optional
+from pydantic import BaseModel,HttpUrl,Field,field_validator
+from typing import List, Literal, Optional
 from datetime import datetime
 
+class GeoPoint(BaseModel):
+    type: Literal["Point"] = "Point"
+    coordinates: List[float]  # GeoJSON order: [longitude, latitude]
+
+    @field_validator("coordinates")
+    @classmethod
+    def check_coordinates(cls, value):
+        if len(value) != 2:
+            raise ValueError("coordinates must be [longitude, latitude]")
+        lng, lat = value
+        if not (-180 <= lng <= 180 and -90 <= lat <= 90):
+            raise ValueError("coordinates out of range")
+        return value
+
 class Event(BaseModel):
     id: Optional[str] = Field(None, description="Auto-generated ID")
     title: str
     description: str
     date: datetime
     location: str
+    geo: Optional[GeoPoint] = None  # Resolved from location when not given
     price: Optional[float] = 0.0
     organizer_email: str
     total_seats: int
     available_seats: int
     status: str = "pending"  # "pending", "approved", "rejected"
     image_url: Optional[str]
+
+class NearbyEvent(Event):
+    distance_km: float
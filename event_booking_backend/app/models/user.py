@@ -8,6 +8,8 @@ from typing import List, Optional
 class BookingEntry(BaseModel):
     event_id: str
     user_email: str
+    ticket_id: Optional[str] = None
+    ticket: Optional[str] = None  # Signed QR payload
 
 class RoleEnum(str, Enum):
     admin = "admin"
@@ -31,6 +33,9 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
 class UserPublic(BaseModel):
     id: str # Map MongoDB's _id to id
     email: str
@@ -3,16 +3,17 @@ from typing import List, Optional
 
 from app.models.user import OrganizerStatus, UserInDB, UserUpdate, UserPublic
 from app.core.security import get_current_admin
-from app.core.database import db
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from app.models.user import UserCreate, UserPublic, RoleEnum, OrganizerUpdate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, revoke_user
 from app.core.security import get_current_admin
-from app.core.database import db
+from app.dependencies.resources import get_db, get_settings, get_revocations
 from datetime import datetime
-import os
 from app.models.event import Event
+from app.core.profiling import list_profiles, get_profile
+from app.services.bulk_service import FORMATS, EXPORT_BATCH_SIZE, stream_rows
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -20,7 +21,9 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 async def update_organizer_status(
     user_id: str,
     update_data: OrganizerUpdate,
-    admin: dict = Depends(get_current_admin)
+    admin: dict = Depends(get_current_admin),
+    db=Depends(get_db),
+    revocations=Depends(get_revocations)
 ):
     try:
         obj_id = ObjectId(user_id)
@@ -45,6 +48,10 @@ async def update_organizer_status(
     if result.modified_count == 0:
         raise HTTPException(500, "Update failed")
 
+    # Cut off existing logins of organizers that are no longer approved
+    if update_data.status != OrganizerStatus.approved:
+        await revoke_user(db, revocations, obj_id)
+
     # Get updated document
     updated_organizer = await db.users.find_one({"_id": obj_id})
     
@@ -56,7 +63,7 @@ async def update_organizer_status(
 
 
 
-async def is_first_admin() -> bool:
+async def is_first_admin(db) -> bool:
     """Check if no admins exist in the system"""
     count = await db.users.count_documents({"role": RoleEnum.admin})
     return count == 0
@@ -64,7 +71,9 @@ async def is_first_admin() -> bool:
 @router.post("/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
 async def register_admin(
     user: UserCreate,
-    setup_token: Optional[str] = None
+    setup_token: Optional[str] = None,
+    db=Depends(get_db),
+    settings=Depends(get_settings)
 ):
     """
     Register a new admin account (protected)
@@ -80,11 +89,11 @@ async def register_admin(
         )
 
     # Check existing admins and validate access
-    first_admin = await is_first_admin()
+    first_admin = await is_first_admin(db)
     
     if first_admin:
         # Validate setup token for initial admin
-        if setup_token != os.getenv("INITIAL_ADMIN_TOKEN"):
+        if setup_token != settings.initial_admin_token:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid setup token for initial admin"
@@ -127,7 +136,8 @@ async def register_admin(
 @router.get("/organizers", response_model=List[UserPublic])
 async def get_all_organizers(
     status: Optional[OrganizerStatus] = None,  # Add this if you want filtering
-    admin: UserInDB = Depends(get_current_admin)
+    admin: UserInDB = Depends(get_current_admin),
+    db=Depends(get_db)
 ):
     """
     Get list of all organizers (admin-only)
@@ -162,7 +172,9 @@ async def get_all_organizers(
 @router.delete("/organizers/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_organizer(
     user_id: str,
-    admin: dict = Depends(get_current_admin)  # Ensure only admin can access
+    admin: dict = Depends(get_current_admin),  # Ensure only admin can access
+    db=Depends(get_db),
+    revocations=Depends(get_revocations)
 ):
     """
     Delete an organizer by ID (Admin-only)
@@ -183,12 +195,66 @@ async def delete_organizer(
     if result.deleted_count == 0:
         raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete organizer")
 
+    await revoke_user(db, revocations, obj_id)
+
     return {"message": "Organizer deleted successfully"}
 
 
 @router.get("/all_events", response_model=List[Event])
-async def list_approved_events(admin: dict = Depends(get_current_admin)  ):
+async def list_approved_events(admin: dict = Depends(get_current_admin), db=Depends(get_db)):
     events = await db.events.find().to_list(100)
     for event in events:
         event["id"] = str(event["_id"])  # Convert ObjectId to string
-    return events
\ No newline at end of file
+    return events
+
+
+@router.get("/profiles")
+async def get_profiles(admin: dict = Depends(get_current_admin)):
+    """
+    List recently profiled requests, newest first (admin-only)
+    Send `X-Profile: 1` with an admin token to profile a request.
+    """
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile_details(profile_id: str, admin: dict = Depends(get_current_admin)):
+    """
+    Full profile: sampled call tree, Mongo command timeline and
+    event loop blocking intervals (admin-only)
+    """
+    profile = get_profile(profile_id)
+    if not profile:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
+
+
+@router.get("/events/export")
+async def export_events(
+    format: str = "ndjson",
+    status: Optional[str] = None,
+    admin: dict = Depends(get_current_admin),
+    db=Depends(get_db)
+):
+    """
+    Stream the full event catalog as NDJSON or CSV (admin-only)
+    Optional query params:
+    - status: filter by approval status
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+
+    query = {"status": status} if status else {}
+    cursor = db.events.find(query).batch_size(EXPORT_BATCH_SIZE)
+    fields = ["id", *(f for f in Event.model_fields if f != "id"), "organizer_id"]
+
+    async def rows():
+        async for event in cursor:
+            event["id"] = event.pop("_id")
+            yield event
+
+    return StreamingResponse(
+        stream_rows(rows(), format, fields),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=events.{format}"}
+    )
@@ -1,22 +1,24 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from app.models.user import UserCreate, UserLogin, OrganizerStatus, RoleEnum
+from app.models.user import UserCreate, UserLogin, OrganizerStatus, RoleEnum, TokenRefresh
 from app.core.security import (
     get_password_hash,
     verify_password,
     create_access_token,
-    
+    create_token_pair,
+    use_refresh_token,
+    revoke_session,
 )
 from app.core.security import (
     get_current_user,
     get_current_admin
 )
-from app.core.config import db
+from app.dependencies.resources import get_db, get_settings, get_revocations
 from typing import Optional
 from datetime import datetime
 router = APIRouter()
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register(user: UserCreate):
+async def register(user: UserCreate, db=Depends(get_db)):
     """
     Register a new user with role-based validation:
     - Organizers get 'pending' status
@@ -62,7 +64,7 @@ async def register(user: UserCreate):
     }
 
 @router.post("/login")
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, db=Depends(get_db), settings=Depends(get_settings)):
     """
     User login with additional organizer status checks
     """
@@ -82,21 +84,56 @@ async def login(credentials: UserLogin):
                 detail="Organizer account pending admin approval"
             )
 
-    # Use user ID instead of email for JWT subject
-    access_token = create_access_token({
-        "sub": str(db_user["_id"]),  # MUST be user ID
-        "role": db_user["role"]       # MUST include role
-    })
+    # Short-lived access token plus a rotating refresh token
+    tokens = await create_token_pair(db, settings, db_user)
 
     return {
         "id":str(db_user["_id"]),
-        "access_token": access_token,
-        "token_type": "bearer",
+        **tokens,
         "user_role": db_user["role"],
         "user_status": db_user.get("status"),
         
     }
 
+@router.post("/refresh")
+async def refresh(
+    body: TokenRefresh,
+    db=Depends(get_db),
+    settings=Depends(get_settings),
+    revocations=Depends(get_revocations)
+):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+    The account is re-checked here, so bans also stop token renewal.
+    """
+    stored = await use_refresh_token(db, revocations, body.refresh_token)
+
+    db_user = await db.users.find_one({"_id": stored["user_id"]})
+    if (
+        not db_user
+        or db_user.get("disabled")
+        or (db_user.get("role") == RoleEnum.organizer and db_user.get("status") != OrganizerStatus.approved)
+    ):
+        await revoke_session(db, revocations, stored["session_id"])
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account is no longer active"
+        )
+
+    return await create_token_pair(db, settings, db_user, stored["session_id"])
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    current_user: dict = Depends(get_current_user),
+    db=Depends(get_db),
+    revocations=Depends(get_revocations)
+):
+    """
+    Revoke the current session's refresh and access tokens
+    """
+    if current_user.get("session_id"):
+        await revoke_session(db, revocations, current_user["session_id"])
+
 # # Admin-only endpoints
 # @router.put("/admin/organizers/{user_id}/approve", dependencies=[Depends(get_current_admin)])
 # async def approve_organizer(user_id: str):
@@ -1,20 +1,41 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.models.booking import Booking
-from app.core.config import db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, create_ticket
+from app.dependencies.resources import get_db, get_settings
 from pymongo import ReturnDocument
+from bson import ObjectId
 
 router = APIRouter()
 
 @router.post("/book")
-async def book_event(booking: Booking, user=Depends(get_current_user)):
+async def book_event(
+    booking: Booking,
+    user=Depends(get_current_user),
+    db=Depends(get_db),
+    settings=Depends(get_settings)
+):
+    if not ObjectId.is_valid(booking.event_id):
+        raise HTTPException(status_code=400, detail="Invalid event ID format")
+
+    # The booking mints a usable door ticket, so it must be for the caller
+    # and for an event that is open for booking
+    if booking.user_email != user["email"]:
+        raise HTTPException(status_code=403, detail="Can only book for your own account")
+
+    event = await db.events.find_one({"_id": ObjectId(booking.event_id), "status": "approved"}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    event_id = str(event["_id"])  # Canonical form, as matched by manifests and check-ins
+
+    ticket_id = str(ObjectId())
     update_result = await db.users.find_one_and_update(
-        {"email": booking.user_email},
+        {"_id": user["_id"]},
         {
             "$push": {
                 "booked_events": {
-                    "event_id": booking.event_id,
-                    "user_email": booking.user_email
+                    "event_id": event_id,
+                    "user_email": booking.user_email,
+                    "ticket_id": ticket_id
                 }
             }
         },
@@ -23,4 +44,9 @@ async def book_event(booking: Booking, user=Depends(get_current_user)):
     if not update_result:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return {"message": "Booking added successfully", "user_id": str(update_result["_id"])}
+    return {
+        "message": "Booking added successfully",
+        "user_id": str(update_result["_id"]),
+        "ticket_id": ticket_id,
+        "ticket": create_ticket(event_id, ticket_id, settings.secret_key)
+    }
@@ -1,24 +1,66 @@
 from app.models.user import UserInDB
 from app.dependencies.auth import get_current_user
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.models.event import Event
-from app.core.config import db
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from app.services.bulk_service import FORMATS, EXPORT_BATCH_SIZE, iter_records, import_documents, stream_rows
+from app.services.geocoding import geocode
+from app.services.search_service import build_nearby_pipeline
+from app.models.event import Event, NearbyEvent
+from app.models.booking import CheckInBatch
+from app.core.security import create_ticket, get_ticket_key, verify_ticket
+from app.dependencies.resources import get_db, get_settings, get_geocoder, get_image_store
 from app.services.auth_service import role_required
+from app.services.image_service import THUMBNAIL_SIZES, THUMBNAIL_MEDIA_TYPE, MAX_UPLOAD_BYTES, ImageStorageFull
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from typing import List
 from typing import Optional
+from datetime import datetime
+import base64
+import json
+import re
 
 
 router = APIRouter()
 
-@router.post("/create", status_code=status.HTTP_201_CREATED)
-async def create_event(event: Event, user=Depends(role_required(["organizer"]))):
-    event_dict = event.dict()
+ATTENDEE_FIELDS = ["user_id", "email", "full_name", "tickets"]
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+async def get_managed_event(db, event_id: str, user: dict) -> dict:
+    """Fetch an event the user may manage: admins any event, organizers their own."""
+    try:
+        obj_id = ObjectId(event_id)
+    except:
+        raise HTTPException(status_code=400, detail="Invalid event ID format")
+
+    event = await db.events.find_one({"_id": obj_id}, {"organizer_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if user["role"] != "admin" and event.get("organizer_id") != user["_id"]:
+        raise HTTPException(status_code=403, detail="Not the organizer of this event")
+    return event
+
+def new_event_document(event: Event, organizer_id: ObjectId) -> dict:
+    event_dict = event.dict(exclude={"id"})  # Exported files carry the old ID
     event_dict.update({
         "status": "pending",
         "available_seats": event_dict["total_seats"],  # Auto-set from total seats
-        "organizer_id": user["_id"]  # Add organizer ID from auth token
+        "organizer_id": organizer_id  # Add organizer ID from auth token
     })
+    return event_dict
+
+@router.post("/create", status_code=status.HTTP_201_CREATED)
+async def create_event(
+    event: Event,
+    user=Depends(role_required(["organizer"])),
+    db=Depends(get_db),
+    geocoder=Depends(get_geocoder)
+):
+    event_dict = new_event_document(event, user["_id"])
+    if not event_dict["geo"]:
+        event_dict["geo"] = await geocode(geocoder, event.location)
     
     result = await db.events.insert_one(event_dict)
     return {
@@ -26,15 +68,78 @@ async def create_event(event: Event, user=Depends(role_required(["organizer"])))
         "event_id": str(result.inserted_id)
     }
 
+@router.post("/import")
+async def import_events(
+    request: Request,
+    format: Optional[str] = None,
+    user=Depends(role_required(["organizer"])),
+    db=Depends(get_db),
+    geocoder=Depends(get_geocoder)
+):
+    """
+    Bulk-create events from an NDJSON or CSV request body.
+    The body is parsed as it streams in and inserted in batches;
+    invalid rows are skipped and reported by row number.
+    Format is taken from the `format` query param or the Content-Type.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        format = next((f for f, media in FORMATS.items() if media == content_type), "ndjson")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+
+    def build_document(event: Event) -> dict:
+        return new_event_document(event, user["_id"])
+
+    # Rows may omit available_seats (always reset to total_seats), image_url and geo
+    async def records():
+        async for row, record in iter_records(request.stream(), format):
+            if isinstance(record, dict):
+                # Placeholder when total_seats is missing, so only that error is reported
+                record.setdefault("available_seats", record.get("total_seats") or 0)
+                record.setdefault("image_url", None)
+                if isinstance(record.get("geo"), str):  # CSV cells hold GeoJSON text
+                    try:
+                        record["geo"] = json.loads(record["geo"])
+                    except ValueError:
+                        pass  # Left for validation to report
+                if not record.get("geo") and isinstance(record.get("location"), str):
+                    record["geo"] = await geocode(geocoder, record["location"])
+            yield row, record
+
+    report = await import_documents(db.events, records(), Event, build_document)
+    return {"message": "Import finished", **report.as_dict()}
+
 @router.get("/", response_model=List[Event])
-async def list_approved_events():
+async def list_approved_events(db=Depends(get_db)):
     events = await db.events.find({"status": "approved"}).to_list(100)
     for event in events:
         event["id"] = str(event["_id"])  # Convert ObjectId to string
     return events
 
+@router.get("/nearby", response_model=List[NearbyEvent])
+async def list_nearby_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25, gt=0, le=500),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_db)
+):
+    """
+    Approved events within `radius_km` of a point, nearest first.
+    Optional `start`/`end` restrict the event date window.
+    """
+    pipeline = build_nearby_pipeline(lng, lat, radius_km, start, end, skip, limit)
+    events = await db.events.aggregate(pipeline).to_list(limit)
+    for event in events:
+        event["id"] = str(event["_id"])  # Convert ObjectId to string
+    return events
+
 @router.put("/{event_id}/approved", response_model=Event)
-async def approve_event(event_id: str, user=Depends(role_required(["admin"]))):
+async def approve_event(event_id: str, user=Depends(role_required(["admin"])), db=Depends(get_db)):
     try:
         obj_id = ObjectId(event_id)
     except:
@@ -55,7 +160,7 @@ async def approve_event(event_id: str, user=Depends(role_required(["admin"]))):
     return updated_event
 
 @router.put("/{event_id}/rejected", response_model=Event)
-async def reject_event(event_id: str, user=Depends(role_required(["admin"]))):
+async def reject_event(event_id: str, user=Depends(role_required(["admin"])), db=Depends(get_db)):
     try:
         obj_id = ObjectId(event_id)
     except:
@@ -75,8 +180,137 @@ async def reject_event(event_id: str, user=Depends(role_required(["admin"]))):
     return updated_event
 
 
+@router.get("/{event_id}/attendees")
+async def export_attendees(
+    event_id: str,
+    format: str = "csv",
+    user=Depends(role_required(["organizer", "admin"])),
+    db=Depends(get_db)
+):
+    """
+    Stream the attendee manifest for an event as CSV or NDJSON.
+    One row per attendee, with the number of tickets they booked.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+    event = await get_managed_event(db, event_id, user)
+    event_id = str(event["_id"])
+    # Bookings store the canonical lowercase ID; older ones may hold the
+    # uppercase form a client sent
+    event_ids = [event_id, event_id.upper()]
+
+    # Uses the booked_events.event_id index; no sort so rows stream as found
+    pipeline = [
+        {"$match": {"booked_events.event_id": {"$in": event_ids}}},
+        {"$project": {
+            "_id": 0,
+            "user_id": "$_id",
+            "email": 1,
+            "full_name": 1,
+            "tickets": {"$size": {"$filter": {
+                "input": "$booked_events",
+                "as": "booking",
+                "cond": {"$in": ["$$booking.event_id", event_ids]}
+            }}}
+        }}
+    ]
+    cursor = db.users.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE)
+
+    return StreamingResponse(
+        stream_rows(cursor, format, ATTENDEE_FIELDS),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=attendees-{event_id}.{format}"}
+    )
+
+
+@router.get("/{event_id}/scanner_key")
+async def get_scanner_key(
+    event_id: str,
+    user=Depends(role_required(["organizer", "admin"])),
+    db=Depends(get_db),
+    settings=Depends(get_settings)
+):
+    """
+    Key for verifying this event's tickets offline on scanning devices.
+    It only validates tickets for this one event.
+    """
+    event = await get_managed_event(db, event_id, user)
+    return {
+        "event_id": str(event["_id"]),
+        "algorithm": "HMAC-SHA256-128",
+        "key": base64.urlsafe_b64encode(get_ticket_key(event_id, settings.secret_key)).decode()
+    }
+
+
+@router.post("/{event_id}/checkins")
+async def check_in_tickets(
+    event_id: str,
+    batch: CheckInBatch,
+    user=Depends(role_required(["organizer", "admin"])),
+    db=Depends(get_db),
+    settings=Depends(get_settings)
+):
+    """
+    Upload ticket scans collected at the door, possibly offline.
+    Each scan is reported as checked_in, duplicate (ticket already used)
+    or invalid, in the order it was sent.
+    """
+    event = await get_managed_event(db, event_id, user)
+    event_id = str(event["_id"])  # Canonical form, as decoded from tickets
+    key = get_ticket_key(event_id, settings.secret_key)
+
+    statuses = [None] * len(batch.scans)
+    operations = []
+    operation_scans = []  # operation index -> scan index
+    seen = set()
+    for i, scan in enumerate(batch.scans):
+        ticket = verify_ticket(scan.ticket, key)
+        if not ticket or ticket["event_id"] != event_id:
+            statuses[i] = "invalid"
+            continue
+        if ticket["ticket_id"] in seen:
+            statuses[i] = "duplicate"
+            continue
+        seen.add(ticket["ticket_id"])
+
+        # Only the first check-in for a ticket inserts; later ones match it
+        operations.append(UpdateOne(
+            {"_id": ObjectId(ticket["ticket_id"])},
+            {"$setOnInsert": {
+                "event_id": event_id,
+                "scanned_at": scan.scanned_at,
+                "device_id": scan.device_id,
+                "checked_in_by": user["_id"],
+                "received_at": datetime.utcnow()
+            }},
+            upsert=True
+        ))
+        operation_scans.append(i)
+
+    if operations:
+        try:
+            result = await db.checkins.bulk_write(operations, ordered=False)
+            upserted = set(result.upserted_ids)
+        except BulkWriteError as e:
+            # Concurrent uploads of the same ticket race on _id; the loser is a duplicate
+            upserted = {u["index"] for u in e.details.get("upserted", [])}
+            failed = {err["index"] for err in e.details.get("writeErrors", []) if err.get("code") != 11000}
+            if failed:
+                raise HTTPException(status_code=500, detail="Check-in failed")
+
+        for op_index, scan_index in enumerate(operation_scans):
+            statuses[scan_index] = "checked_in" if op_index in upserted else "duplicate"
+
+    return {
+        "checked_in": statuses.count("checked_in"),
+        "duplicates": statuses.count("duplicate"),
+        "invalid": statuses.count("invalid"),
+        "results": statuses
+    }
+
+
 @router.get("/organize_events", response_model=List[Event])
-async def list_approved_events(user=Depends(role_required(["organizer"]))):
+async def list_approved_events(user=Depends(role_required(["organizer"])), db=Depends(get_db)):
     events = await db.events.find().to_list(100)
     for event in events:
         event["id"] = str(event["_id"])  # Convert ObjectId to string
@@ -85,12 +319,21 @@ async def list_approved_events(user=Depends(role_required(["organizer"]))):
 
 
 @router.get("/users/{user_id}", response_model=UserInDB)
-async def get_user_details(user_id: str):
+async def get_user_details(
+    user_id: str,
+    current_user=Depends(get_current_user),
+    db=Depends(get_db),
+    settings=Depends(get_settings)
+):
     try:
         obj_id = ObjectId(user_id)  # Convert user_id to ObjectId
     except:
         raise HTTPException(status_code=400, detail="Invalid user ID format")
 
+    # Booked events carry usable tickets, so only the owner or an admin may see them
+    if obj_id != current_user["_id"] and current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not allowed to view this user")
+
     user_data = await db.users.find_one({"_id": obj_id})
     
     if not user_data:
@@ -130,6 +373,8 @@ async def get_user_details(user_id: str):
                     "status": event_data.get("status", ""),
                     "organizer_id": str(event_data.get("organizer_id", "")),
                     "image_url": event_data.get("image_url", ""),
+                    "ticket_id": event.get("ticket_id"),
+                    "ticket": create_ticket(event_id, event["ticket_id"], settings.secret_key) if event.get("ticket_id") else None,
                 })
 
         user_data["booked_events"] = booked_events  # ✅ Ensure correct format
@@ -141,7 +386,7 @@ async def get_user_details(user_id: str):
 
 
 @router.get("/get_e/{event_id}", response_model=Optional[Event])
-async def get_event_by_id(event_id: str):
+async def get_event_by_id(event_id: str, db=Depends(get_db)):
     event = await db.events.find_one({"_id": ObjectId(event_id)})
 
     if not event:
@@ -149,4 +394,62 @@ async def get_event_by_id(event_id: str):
 
     event["id"] = str(event["_id"])  # Convert ObjectId to string
 
-    return event
\ No newline at end of file
+    return event
+
+
+@router.post("/{event_id}/image")
+async def upload_event_image(
+    event_id: str,
+    request: Request,
+    image: UploadFile = File(...),
+    user=Depends(role_required(["organizer"])),
+    db=Depends(get_db),
+    settings=Depends(get_settings),
+    images=Depends(get_image_store)
+):
+    """
+    Upload the cover image for an event. The image is resized into
+    thumbnails and served from the local image cache.
+    """
+    event = await get_managed_event(db, event_id, user)
+
+    data = await image.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+
+    try:
+        digest = await images.ingest(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImageStorageFull as e:
+        raise HTTPException(status_code=status.HTTP_507_INSUFFICIENT_STORAGE, detail=str(e))
+
+    # Absolute, since clients put image_url straight into <img src> on another origin
+    base_url = (settings.public_api_url or str(request.base_url)).rstrip("/")
+    thumbnails = {size: f"{base_url}/events/images/{digest}/{size}" for size in THUMBNAIL_SIZES}
+    image_url = thumbnails["md"]
+    await db.events.update_one({"_id": event["_id"]}, {"$set": {"image_url": image_url}})
+
+    return {
+        "message": "Image uploaded successfully",
+        "image_url": image_url,
+        "thumbnails": thumbnails
+    }
+
+
+@router.get("/images/{digest}/{size}")
+async def get_event_image(digest: str, size: str, request: Request, images=Depends(get_image_store)):
+    if not DIGEST_RE.match(digest) or size not in THUMBNAIL_SIZES:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    # Content-addressed, so the digest and size fully identify the bytes
+    headers = {"ETag": f'"{digest}-{size}"', "Cache-Control": IMAGE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Read into memory (thumbnails are small) so eviction cannot race the response
+    data = await images.get_thumbnail(digest, size)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return Response(data, media_type=THUMBNAIL_MEDIA_TYPE, headers=headers)
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.models.user import UserCreate, UserPublic
 from app.dependencies.auth import get_current_user
-from app.core.database import db
+from app.dependencies.resources import get_db
 from app.core.security import get_password_hash
 
 router = APIRouter(prefix="/organizers", tags=["organizers"])
 
 @router.post("/register", response_model=UserPublic)
-async def register_organizer(user: UserCreate):
+async def register_organizer(user: UserCreate, db=Depends(get_db)):
     existing_user = await db["users"].find_one({"email": user.email})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
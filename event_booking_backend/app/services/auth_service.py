@@ -2,7 +2,6 @@ from app.core.security import get_current_user
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import OAuth2PasswordBearer
 import jwt
-from app.core.config import SECRET_KEY, ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
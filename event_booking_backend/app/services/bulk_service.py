@@ -0,0 +1,203 @@
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from bson import ObjectId
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+INSERT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def to_jsonable(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_jsonable(v) for v in value]
+    return value
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines without buffering more than one
+    chunk plus one partial line.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, object]]:
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, json.loads(line)
+        except ValueError as e:
+            yield row, e
+
+
+async def _iter_csv(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, object]]:
+    header = None
+    row = 0
+    record = ""
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        # Empty cells fall back to the model defaults
+        yield row, {k: v for k, v in zip(header, values) if v != ""}
+
+    if record:
+        yield row + 1, ValueError("Unterminated quoted field")
+
+
+def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Yield ``(row_number, record)`` pairs from an uploaded NDJSON or CSV
+    stream. ``record`` is an exception when the row could not be parsed.
+    """
+    lines = iter_lines(chunks)
+    return _iter_csv(lines) if fmt == "csv" else _iter_ndjson(lines)
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.error_count = 0
+        self.errors: List[Dict] = []
+
+    def add_error(self, row: int, error: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+    def as_dict(self) -> Dict:
+        return {
+            "inserted": self.inserted,
+            "failed": self.error_count,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+
+async def import_documents(
+    collection,
+    records: AsyncIterator[Tuple[int, object]],
+    model: type,
+    build_document: Callable[[BaseModel], Dict],
+) -> ImportReport:
+    """
+    Validate records against ``model`` and insert them in unordered batches,
+    so a bad row only costs its own insert.
+    """
+    report = ImportReport()
+    batch: List[Dict] = []
+    batch_rows: List[int] = []
+
+    async def flush():
+        try:
+            result = await collection.insert_many(batch, ordered=False)
+            report.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            report.inserted += e.details.get("nInserted", 0)
+            for error in e.details.get("writeErrors", []):
+                report.add_error(batch_rows[error["index"]], error.get("errmsg", "Write failed"))
+        batch.clear()
+        batch_rows.clear()
+
+    async for row, record in records:
+        if isinstance(record, Exception):
+            report.add_error(row, str(record))
+            continue
+        if not isinstance(record, dict):
+            report.add_error(row, "Expected an object")
+            continue
+
+        try:
+            document = build_document(model.model_validate(record))
+        except ValidationError as e:
+            report.add_error(row, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+
+        batch.append(document)
+        batch_rows.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+    return report
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+async def stream_rows(cursor, fmt: str, fields: List[str]) -> AsyncIterator[str]:
+    """
+    Serialize cursor documents as NDJSON or CSV, yielding one chunk per
+    ``EXPORT_BATCH_SIZE`` documents so memory stays flat for any result size.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+
+    count = 0
+    async for doc in cursor:
+        doc = to_jsonable(doc)
+        if writer:
+            writer.writerow([_csv_cell(doc.get(f)) for f in fields])
+        else:
+            buffer.write(json.dumps({f: doc.get(f) for f in fields}))
+            buffer.write("\n")
+
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,143 @@
+import csv
+import importlib
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.core.config import Settings
+
+LngLat = Tuple[float, float]
+
+# Offline stand-in for a real geocoding API: city -> (longitude, latitude)
+DEFAULT_GAZETTEER: Dict[str, LngLat] = {
+    "mumbai": (72.8777, 19.0760),
+    "delhi": (77.2090, 28.6139),
+    "new delhi": (77.2090, 28.6139),
+    "bengaluru": (77.5946, 12.9716),
+    "bangalore": (77.5946, 12.9716),
+    "hyderabad": (78.4867, 17.3850),
+    "chennai": (80.2707, 13.0827),
+    "kolkata": (88.3639, 22.5726),
+    "pune": (73.8567, 18.5204),
+    "ahmedabad": (72.5714, 23.0225),
+    "jaipur": (75.7873, 26.9124),
+    "lucknow": (80.9462, 26.8467),
+    "chandigarh": (76.7794, 30.7333),
+    "kochi": (76.2673, 9.9312),
+    "goa": (73.8278, 15.4909),
+    "indore": (75.8577, 22.7196),
+    "bhopal": (77.4126, 23.2599),
+    "nagpur": (79.0882, 21.1458),
+    "surat": (72.8311, 21.1702),
+    "patna": (85.1376, 25.5941),
+    "london": (-0.1276, 51.5072),
+    "paris": (2.3522, 48.8566),
+    "berlin": (13.4050, 52.5200),
+    "amsterdam": (4.9041, 52.3676),
+    "new york": (-74.0060, 40.7128),
+    "san francisco": (-122.4194, 37.7749),
+    "los angeles": (-118.2437, 34.0522),
+    "chicago": (-87.6298, 41.8781),
+    "toronto": (-79.3832, 43.6532),
+    "dubai": (55.2708, 25.2048),
+    "singapore": (103.8198, 1.3521),
+    "tokyo": (139.6503, 35.6762),
+    "sydney": (151.2093, -33.8688),
+}
+
+
+class Geocoder(ABC):
+    """
+    Resolves a free-text location to a (longitude, latitude) pair.
+    Set the GEOCODER env var to the dotted path of a subclass to plug in
+    a real provider; it is constructed with the app settings.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings
+
+    @abstractmethod
+    async def resolve(self, location: str) -> Optional[LngLat]:
+        """Return (longitude, latitude), or None if the location is unknown."""
+
+
+class GazetteerGeocoder(Geocoder):
+    """
+    Looks up known place names, either the whole location string or any
+    comma-separated part of it ("Hall 3, NESCO, Mumbai" -> Mumbai).
+    Extra places can be loaded from a `name,latitude,longitude` CSV.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        super().__init__(settings)
+        self.places = dict(DEFAULT_GAZETTEER)
+        if settings and settings.gazetteer_path:
+            with open(settings.gazetteer_path, newline="") as f:
+                for row in csv.DictReader(f):
+                    self.places[row["name"].strip().lower()] = (
+                        float(row["longitude"]), float(row["latitude"])
+                    )
+
+    async def resolve(self, location: str) -> Optional[LngLat]:
+        name = " ".join(location.lower().split())
+        if name in self.places:
+            return self.places[name]
+        for part in reversed(name.split(",")):
+            part = part.strip()
+            if part in self.places:
+                return self.places[part]
+        return None
+
+
+def load_geocoder(settings: Settings) -> Geocoder:
+    """Construct the GEOCODER class; fails at startup if it is not a complete Geocoder."""
+    module_name, _, class_name = settings.geocoder.rpartition(".")
+    geocoder_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(geocoder_class, type) and issubclass(geocoder_class, Geocoder)):
+        raise TypeError(f"GEOCODER {settings.geocoder} is not a Geocoder subclass")
+    return geocoder_class(settings)
+
+
+def to_geo_point(lnglat: LngLat) -> dict:
+    return {"type": "Point", "coordinates": [lnglat[0], lnglat[1]]}
+
+
+async def geocode(geocoder: Geocoder, location: Optional[str]) -> Optional[dict]:
+    """Resolve a location string to a GeoJSON point, or None if unknown."""
+    if not location:
+        return None
+    lnglat = await geocoder.resolve(location)
+    return to_geo_point(lnglat) if lnglat else None
+
+
+async def backfill_event_locations(collection, geocoder: Geocoder, batch_size: int = 500) -> dict:
+    """
+    Resolve `geo` for every event that does not have one yet.
+    Lookups are memoized per run, since many events share a location.
+    """
+    resolved: Dict[str, Optional[LngLat]] = {}
+    counts = {"updated": 0, "unresolved": 0}
+    updates = []
+
+    cursor = collection.find({"geo": None}, {"location": 1}).batch_size(batch_size)
+    async for event in cursor:
+        location = event.get("location") or ""
+        if location not in resolved:
+            resolved[location] = await geocoder.resolve(location) if location else None
+
+        lnglat = resolved[location]
+        if lnglat is None:
+            counts["unresolved"] += 1
+            continue
+
+        updates.append(UpdateOne({"_id": event["_id"]}, {"$set": {"geo": to_geo_point(lnglat)}}))
+        if len(updates) >= batch_size:
+            result = await collection.bulk_write(updates, ordered=False)
+            counts["updated"] += result.modified_count
+            updates = []
+
+    if updates:
+        result = await collection.bulk_write(updates, ordered=False)
+        counts["updated"] += result.modified_count
+    return counts
@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import Settings
+
+# Thumbnail name -> longest edge in pixels
+THUMBNAIL_SIZES = {"sm": 320, "md": 640, "lg": 1280}
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_MEDIA_TYPE = "image/webp"
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+# Cache hits only rewrite a thumbnail's mtime (its LRU position) this often
+TOUCH_INTERVAL_SECONDS = 60
+# How often each worker re-reads cache totals from disk
+RECONCILE_SECONDS = 60
+# Eviction frees thumbnails down to this fraction of the limit
+EVICT_TO_FRACTION = 0.9
+
+
+def _render_thumbnails(data: bytes) -> Dict[str, bytes]:
+    """
+    Decode an uploaded image and encode every thumbnail size.
+    Runs inside a worker process, so it must only use picklable arguments.
+    Pillow is imported here so only the workers pay for loading it.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+            thumbnails = {}
+            for name, edge in THUMBNAIL_SIZES.items():
+                thumb = img.copy()
+                thumb.thumbnail((edge, edge), Image.LANCZOS)
+                buffer = io.BytesIO()
+                thumb.save(buffer, THUMBNAIL_FORMAT, quality=80, method=4)
+                thumbnails[name] = buffer.getvalue()
+            return thumbnails
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError(f"Unsupported image: {e}")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ImageStorageFull(Exception):
+    """Raised when storing a new original would exceed the originals limit."""
+
+
+def _scan(directory: str) -> List[Tuple[float, str, int]]:
+    """Return (mtime, path, size) for every finished file under ``directory``."""
+    found = []
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith(".tmp"):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed by another worker
+            found.append((st.st_mtime, path, st.st_size))
+    return found
+
+
+class ImageCache:
+    """
+    Content-addressed image store on local disk, shared by all workers.
+
+    Originals are kept under ``originals/`` and never evicted, so any
+    thumbnail can be regenerated; new originals are refused once their
+    total size would exceed ``originals_max_bytes``. Thumbnails live under
+    ``thumbs/`` and are evicted least-recently-used once their total size
+    exceeds ``max_bytes``. Recency is the file modification time (bumped on
+    cache hits), so workers sharing the directory agree on the LRU order.
+
+    Totals are tracked incrementally from this worker's writes and re-read
+    from disk every ``RECONCILE_SECONDS`` to account for other workers.
+    """
+
+    def __init__(self, root: str, max_bytes: int, originals_max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.originals_max_bytes = originals_max_bytes
+        self._lock = threading.Lock()
+        self._thumb_bytes = 0
+        self._original_bytes = 0
+        self._reconciled_at: Optional[float] = None  # Not read from disk yet
+
+    def original_path(self, digest: str) -> str:
+        return os.path.join(self.root, "originals", digest[:2], digest)
+
+    def thumbnail_path(self, digest: str, size: str) -> str:
+        return os.path.join(self.root, "thumbs", digest[:2], f"{digest}_{size}.webp")
+
+    def has_original(self, digest: str) -> bool:
+        return os.path.isfile(self.original_path(digest))
+
+    def lookup(self, digest: str, size: str) -> Optional[str]:
+        """Return the thumbnail path and mark it recently used, or None on a miss."""
+        path = self.thumbnail_path(digest, size)
+        try:
+            if time.time() - os.stat(path).st_mtime > TOUCH_INTERVAL_SECONDS:
+                os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read_thumbnail(self, digest: str, size: str) -> Optional[bytes]:
+        """Return thumbnail bytes, or None if missing or evicted while reading."""
+        path = self.lookup(digest, size)
+        if not path:
+            return None
+        try:
+            return _read_file(path)
+        except FileNotFoundError:
+            return None
+
+    def store(self, digest: str, original: Optional[bytes], thumbnails: Dict[str, bytes]) -> None:
+        with self._lock:
+            self._reconcile_if_stale()
+
+            if original is not None and not self.has_original(digest):
+                if self._original_bytes + len(original) > self.originals_max_bytes:
+                    raise ImageStorageFull("Image storage is full")
+                _atomic_write(self.original_path(digest), original)
+                self._original_bytes += len(original)
+
+            for size, data in thumbnails.items():
+                _atomic_write(self.thumbnail_path(digest, size), data)
+                self._thumb_bytes += len(data)
+
+            if self._thumb_bytes > self.max_bytes:
+                self._evict()
+
+    def _reconcile_if_stale(self):
+        now = time.monotonic()
+        if self._reconciled_at is not None and now - self._reconciled_at < RECONCILE_SECONDS:
+            return
+        self._original_bytes = sum(size for _, _, size in _scan(os.path.join(self.root, "originals")))
+        self._thumb_bytes = sum(size for _, _, size in _scan(os.path.join(self.root, "thumbs")))
+        self._reconciled_at = now
+
+    def _evict(self):
+        # Free down to a low watermark so eviction (a directory scan) runs in batches
+        target = self.max_bytes * EVICT_TO_FRACTION
+        found = _scan(os.path.join(self.root, "thumbs"))
+        total = sum(size for _, _, size in found)
+        for _, path, size in sorted(found):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._thumb_bytes = total
+
+
+class ImageStore:
+    """
+    Image cache plus the process pool that renders thumbnails.
+    Created in the app lifespan; the pool is only started on first upload.
+    """
+
+    def __init__(self, settings: Settings):
+        self.cache = ImageCache(
+            settings.image_cache_dir,
+            settings.image_cache_max_bytes,
+            settings.image_originals_max_bytes,
+        )
+        self.workers = settings.image_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Not fork: the API process runs Motor and executor threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def ingest(self, data: bytes) -> str:
+        """
+        Store an uploaded image and its thumbnails, returning its content digest.
+        Decoding and resizing run in the process pool; hashing and disk writes
+        run in the default thread pool so the event loop is never blocked.
+        """
+        loop = asyncio.get_running_loop()
+        cache = self.cache
+
+        digest = await loop.run_in_executor(None, lambda: hashlib.sha256(data).hexdigest())
+        if cache.has_original(digest) and all(cache.lookup(digest, size) for size in THUMBNAIL_SIZES):
+            return digest
+
+        thumbnails = await loop.run_in_executor(self._get_executor(), _render_thumbnails, data)
+        await loop.run_in_executor(None, cache.store, digest, data, thumbnails)
+        return digest
+
+    async def get_thumbnail(self, digest: str, size: str) -> Optional[bytes]:
+        """
+        Return a thumbnail's bytes, regenerating it from the stored original
+        if it was evicted. Returns None for unknown digests.
+        """
+        cache = self.cache
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, cache.read_thumbnail, digest, size)
+        if data is not None:
+            return data
+
+        if not cache.has_original(digest):
+            return None
+
+        original = await loop.run_in_executor(None, _read_file, cache.original_path(digest))
+        thumbnails = await loop.run_in_executor(self._get_executor(), _render_thumbnails, original)
+        await loop.run_in_executor(None, cache.store, digest, None, thumbnails)
+        # Serve what was rendered, even if another worker evicts it right away
+        return thumbnails[size]
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List, Optional
+
+
+def build_nearby_pipeline(
+    lng: float,
+    lat: float,
+    radius_km: float,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    Aggregation pipeline for approved events within `radius_km` of a point,
+    nearest first. Backed by the `geo` 2dsphere index.
+    """
+    query = {"status": "approved"}
+    if start or end:
+        query["date"] = {}
+        if start:
+            query["date"]["$gte"] = start
+        if end:
+            query["date"]["$lte"] = end
+
+    return [
+        {
+            "$geoNear": {
+                "near": {"type": "Point", "coordinates": [lng, lat]},
+                "key": "geo",
+                "distanceField": "distance_km",
+                "distanceMultiplier": 0.001,  # metres -> km
+                "maxDistance": radius_km * 1000,
+                "spherical": True,
+                "query": query,
+            }
+        },
+        {"$skip": skip},
+        {"$limit": limit},
+    ]
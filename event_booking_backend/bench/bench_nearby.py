@@ -0,0 +1,132 @@
+"""
+Benchmark `/events/nearby` queries on a large synthetic catalog.
+
+Seeds a separate `<DATABASE_NAME>_bench` database with events scattered
+around the gazetteer cities, then compares the 2dsphere-backed pipeline
+with the old approach of downloading every approved event and filtering
+by distance client-side.
+
+Usage (from event_booking_backend/, needs MONGODB_URL):
+    python -m bench.bench_nearby [--events 1000000] [--queries 200]
+"""
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, GEOSPHERE
+
+from app.core.config import Settings
+from app.core.database import create_client
+from app.services.geocoding import DEFAULT_GAZETTEER, to_geo_point
+from app.services.search_service import build_nearby_pipeline
+
+INSERT_BATCH = 10_000
+RADIUS_KM = 25
+
+
+def haversine_km(lng1, lat1, lng2, lat2):
+    lng1, lat1, lng2, lat2 = map(math.radians, (lng1, lat1, lng2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def synthetic_event(rng: random.Random, places, now: datetime) -> dict:
+    name, (lng, lat) = rng.choice(places)
+    # Roughly +-50 km around the city centre
+    lng += rng.uniform(-0.5, 0.5)
+    lat += rng.uniform(-0.5, 0.5)
+    return {
+        "title": f"Bench event in {name}",
+        "description": "Synthetic benchmark event",
+        "date": now + timedelta(days=rng.randint(-30, 180)),
+        "location": name.title(),
+        "geo": to_geo_point((lng, lat)),
+        "price": 0.0,
+        "organizer_email": "bench@example.com",
+        "total_seats": 100,
+        "available_seats": 100,
+        "status": "approved" if rng.random() < 0.8 else "pending",
+        "image_url": None,
+    }
+
+
+async def seed(collection, count: int, rng: random.Random):
+    await collection.drop()
+    places = list(DEFAULT_GAZETTEER.items())
+    now = datetime.utcnow()
+    for start in range(0, count, INSERT_BATCH):
+        size = min(INSERT_BATCH, count - start)
+        await collection.insert_many([synthetic_event(rng, places, now) for _ in range(size)], ordered=False)
+    await collection.create_index(
+        [("geo", GEOSPHERE), ("status", ASCENDING), ("date", ASCENDING)],
+        name="geo_status_date"
+    )
+
+
+def summarize(label: str, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<28} n={len(timings):<5} p50={statistics.median(timings) * 1000:8.2f} ms  p95={p95 * 1000:8.2f} ms")
+
+
+async def main(events: int, queries: int, seed_value: int, skip_seed: bool):
+    rng = random.Random(seed_value)
+    settings = Settings.from_env()
+    client = create_client(settings)
+    collection = client[f"{settings.database_name}_bench"].events
+
+    if not skip_seed:
+        started = time.perf_counter()
+        await seed(collection, events, rng)
+        print(f"Seeded {events} events in {time.perf_counter() - started:.1f}s")
+
+    points = [(lng + rng.uniform(-0.3, 0.3), lat + rng.uniform(-0.3, 0.3))
+              for _, (lng, lat) in rng.choices(list(DEFAULT_GAZETTEER.items()), k=queries)]
+    now = datetime.utcnow()
+
+    timings = []
+    for lng, lat in points:
+        started = time.perf_counter()
+        await collection.aggregate(build_nearby_pipeline(lng, lat, RADIUS_KM)).to_list(20)
+        timings.append(time.perf_counter() - started)
+    summarize("nearby (2dsphere)", timings)
+
+    timings = []
+    for lng, lat in points:
+        started = time.perf_counter()
+        window = build_nearby_pipeline(lng, lat, RADIUS_KM, now, now + timedelta(days=30))
+        await collection.aggregate(window).to_list(20)
+        timings.append(time.perf_counter() - started)
+    summarize("nearby + 30 day window", timings)
+
+    # Baseline: what a client had to do before, measured on a few points only
+    timings, counts = [], []
+    for lng, lat in points[:3]:
+        started = time.perf_counter()
+        cursor = collection.find({"status": "approved"}, {"geo": 1}).batch_size(INSERT_BATCH)
+        matches = [e async for e in cursor
+                   if haversine_km(lng, lat, *e["geo"]["coordinates"]) <= RADIUS_KM]
+        timings.append(time.perf_counter() - started)
+
+        # Sanity check: the index should find the same events (up to rounding at the edge)
+        indexed = await collection.aggregate(
+            build_nearby_pipeline(lng, lat, RADIUS_KM, limit=len(matches) + 1)
+        ).to_list(None)
+        counts.append((len(matches), len(indexed)))
+    summarize("full scan (client-side)", timings)
+    for scanned, indexed in counts:
+        print(f"  in range: {scanned} by full scan, {indexed} via 2dsphere")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the existing bench collection")
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.queries, args.seed, args.skip_seed))
@@ -0,0 +1,141 @@
+"""
+Benchmark API startup: import time of `app.main` and time to first request.
+
+Import time is measured with `python -X importtime` in fresh interpreters
+with MONGODB_URL and SECRET_KEY unset, since importing the app must need
+neither. Time to first request spawns uvicorn with the app factory and
+polls `/` until it answers; that part needs MONGODB_URL, because the
+lifespan connects to MongoDB, and uses a throwaway SECRET_KEY if none is set.
+
+Usage (from event_booking_backend/):
+    python -m bench.bench_startup [--runs 10] [--top 15] [--skip-server]
+"""
+import argparse
+import os
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+from dotenv import dotenv_values
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_TIMEOUT = 60
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map module name -> cumulative import time in microseconds."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def measure_import(runs: int):
+    # Empty values also stop load_dotenv from filling them in from .env
+    env = {**os.environ, "MONGODB_URL": "", "SECRET_KEY": ""}
+    totals, wall = [], []
+    per_module = defaultdict(list)
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        )
+        wall.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            raise RuntimeError(f"import app.main failed:\n{result.stderr[-2000:]}")
+
+        cumulative = parse_importtime(result.stderr)
+        totals.append(cumulative["app.main"])
+        for name, us in cumulative.items():
+            per_module[name].append(us)
+    return totals, wall, per_module
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_env() -> dict:
+    """Environment for the spawned server: .env and os.environ, plus a throwaway SECRET_KEY."""
+    env = {k: v for k, v in dotenv_values(os.path.join(BACKEND_DIR, ".env")).items() if v is not None}
+    env.update(os.environ)
+    if not env.get("SECRET_KEY"):
+        env["SECRET_KEY"] = secrets.token_urlsafe(32)
+    return env
+
+
+def measure_first_request(runs: int, env: dict):
+    timings = []
+    for _ in range(runs):
+        port = free_port()
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "--factory", "app.main:create_app",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        try:
+            while True:
+                if time.perf_counter() - started > SERVER_TIMEOUT:
+                    raise RuntimeError("Server did not answer in time")
+                if server.poll() is not None:
+                    raise RuntimeError("Server exited during startup")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                        response.read()
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            timings.append(time.perf_counter() - started)
+        finally:
+            server.terminate()
+            server.wait()
+    return timings
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.1f} ms"
+
+
+def main(runs: int, top: int, skip_server: bool):
+    totals, wall, per_module = measure_import(runs)
+    print(f"import app.main (n={runs}, MONGODB_URL and SECRET_KEY unset)")
+    print(f"  cumulative import   median {ms(statistics.median(totals) / 1e6)}  min {ms(min(totals) / 1e6)}")
+    print(f"  interpreter + import median {ms(statistics.median(wall))}  min {ms(min(wall))}")
+    print(f"  slowest modules (median cumulative):")
+    medians = sorted(((statistics.median(v), k) for k, v in per_module.items()), reverse=True)
+    # Skip the root entry itself
+    for us, name in [m for m in medians if m[1] != "app.main"][:top]:
+        print(f"    {ms(us / 1e6)}  {name}")
+
+    if skip_server:
+        return
+    env = server_env()
+    if not env.get("MONGODB_URL"):
+        print("time to first request skipped: MONGODB_URL is not set")
+        return
+
+    timings = measure_first_request(runs, env)
+    print(f"time to first request (uvicorn spawn -> GET / answered, n={runs})")
+    print(f"  median {ms(statistics.median(timings))}  min {ms(min(timings))}  max {ms(max(timings))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list")
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import time")
+    args = parser.parse_args()
+    main(args.runs, args.top, args.skip_server)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.main import create_app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def make_settings(**overrides) -> Settings:
+    return Settings(secret_key="test-secret", **overrides)
+
+
+def test_import_needs_no_environment():
+    # A fresh interpreter, since this process already imported app.main
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        # Empty values also stop load_dotenv from filling them in from .env
+        env={"MONGODB_URL": "", "SECRET_KEY": ""},
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_create_app_serves_without_database():
+    # Without `with`, TestClient skips the lifespan, so no Mongo client is created
+    client = TestClient(create_app(make_settings()))
+
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "Welcome to Event Management API"}
+
+
+def test_protected_route_requires_token():
+    client = TestClient(create_app(make_settings()))
+
+    assert client.post("/auth/logout").status_code == 401
+
+
+def test_create_app_uses_given_settings():
+    app = create_app(make_settings(cors_origins=["https://example.com"]))
+
+    assert app.state.settings.cors_origins == ["https://example.com"]
+
+
+def test_settings_reject_missing_secret_key():
+    with pytest.raises(ValidationError):
+        Settings()
+    with pytest.raises(ValidationError):
+        Settings(secret_key="your_secret")